@@ -7,9 +7,8 @@
 Ce script est un agent autonome qui :
 1. Vous demande vos accès et ce que vous cherchez.
 2. Scanne GitHub via l'API.
-3. Télécharge (clone) les projets en parallèle.
-4. Nettoie les fichiers (.git).
-5. Vous donne un fichier ZIP final.
+3. Télécharge les projets (archives tar.gz, sans .git) en parallèle.
+4. Vous donne un fichier ZIP final.
 """
 
 import os
@@ -18,34 +17,99 @@ import shutil
 import subprocess
 import time
 import re
+import json
+import math
+import heapq
+import itertools
+import io
+import queue
+import threading
+import tarfile
+import zipfile
+from collections import deque
+from urllib.parse import quote
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Tentative d'import des librairies externes
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     from tqdm import tqdm
+    from urllib3.util.retry import Retry
 except ImportError:
     print("❌ Erreur : Il manque des librairies.")
     print("Veuillez lancer : pip install requests tqdm")
     sys.exit(1)
 
+# Parseur JSON plus rapide si disponible (optionnel)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # =====================================================
 # Configuration
 # =====================================================
 
 BASE_DIR = Path.cwd() / "github_agent_downloads"
 WORK_DIR = BASE_DIR / "temp_repos"
+ETAG_CACHE_FILE = BASE_DIR / ".etag_cache.json" # Conservé entre deux lancements
+ETAG_CACHE_MAX_QUERIES = 20 # Recherches les plus récentes gardées en cache
+ETAG_CACHE_TTL = 7 * 24 * 3600 # Entrées inutilisées depuis 7 jours : supprimées
+ZIP_READ_AHEAD_MAX = 8 * 1024 * 1024 # Au-delà, le fichier est copié en streaming
+PIPELINE_MIN_KB = 10 * 1024 # Gros dépôts : réseau et extraction dans deux threads
+DOWNLOAD_TIMEOUT = 180 # 3 minutes max par repo (téléchargement + extraction)
+
+# Les téléchargements attendent le réseau, pas le CPU : on prévoit large
+try:
+    CLONE_WORKERS = max(1, int(os.environ["GITHUB_AGENT_WORKERS"]))
+except (KeyError, ValueError):
+    CLONE_WORKERS = min(32, max(8, (os.cpu_count() or 4) * 4))
+
+# Session HTTP partagée par tous les threads (keep-alive + pool de connexions)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=max(16, CLONE_WORKERS), # Une connexion par thread de téléchargement
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+SESSION.headers.update({
+    "Accept": "application/vnd.github+json",
+    "User-Agent": "Github-Agent-v2"
+})
 
 # =====================================================
 # Fonctions Utilitaires
 # =====================================================
 
+# Garde seulement alphanumérique, tirets et underscores
+_CLEAN_RE = re.compile(r'[^\w\-_]')
+
 def clean_filename(text):
     """Nettoie le nom des dossiers pour éviter les erreurs Windows/Linux."""
-    # Garde seulement alphanumérique, tirets et underscores
-    return re.sub(r'[^\w\-_]', '_', text)
+    return _CLEAN_RE.sub('_', text)
+
+def fast_rmtree(path):
+    """Supprime un dossier avec la commande native (bien plus rapide que shutil.rmtree)."""
+    if sys.platform == "win32":
+        cmd = ["cmd", "/c", "rd", "/s", "/q", str(path)]
+    else:
+        cmd = ["rm", "-rf", str(path)]
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    except FileNotFoundError:
+        pass
+    # Repli si la commande native est absente ou n'a pas tout supprimé
+    if os.path.exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+
+def configure_session(token):
+    """Ajoute le token à la session partagée, une fois pour toutes les requêtes."""
+    if token:
+        SESSION.headers["Authorization"] = f"token {token}"
 
 def print_banner():
     print("\n" + "="*60)
@@ -53,128 +117,394 @@ def print_banner():
     print("      Recherche -> Clone -> Zip")
     print("="*60 + "\n")
 
-def check_git_installed():
-    try:
-        subprocess.run(["git", "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return True
-    except FileNotFoundError:
-        return False
-
 # =====================================================
 # 1. Module de Recherche (API GitHub)
 # =====================================================
 
-def search_github(query, limit, token):
+def load_etag_cache():
+    """Charge le cache (requête, page) -> ETag + résultats des recherches précédentes."""
+    try:
+        return json.loads(ETAG_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_etag_cache(cache):
+    """Écrit le cache borné (TTL + dernières recherches), de façon atomique."""
+    now = time.time()
+    fresh = {k: v for k, v in cache.items() if now - v.get("used", 0) < ETAG_CACHE_TTL}
+
+    # Plusieurs pages par recherche : on garde les ETAG_CACHE_MAX_QUERIES plus récentes
+    last_used = {}
+    for entry in fresh.values():
+        query = entry.get("query")
+        last_used[query] = max(last_used.get(query, 0), entry["used"])
+    kept = set(sorted(last_used, key=last_used.get, reverse=True)[:ETAG_CACHE_MAX_QUERIES])
+    fresh = {k: v for k, v in fresh.items() if v.get("query") in kept}
+
+    # Fichier temporaire propre au processus puis rename(2) : deux lancements
+    # simultanés ne peuvent pas laisser un JSON tronqué
+    tmp_path = f"{ETAG_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        ETAG_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(fresh))
+        os.replace(tmp_path, ETAG_CACHE_FILE)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        # Le cache n'est qu'une optimisation
+
+def fetch_search_page(api_url, params, page, cached=None):
+    """Fonction exécutée par les threads pour récupérer une page de résultats."""
+    # Requête conditionnelle : GitHub répond 304 (sans corps) si rien n'a changé
+    headers = {"If-None-Match": cached["etag"]} if cached else None
+    try:
+        return SESSION.get(api_url, headers=headers, params={**params, "page": page}, timeout=10)
+    except Exception as e:
+        return e
+
+def search_github(query, limit):
     print(f"\n🔎 Recherche des {limit} meilleurs dépôts pour : '{query}'...")
     
     api_url = "https://api.github.com/search/repositories"
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "Github-Agent-v2"
-    }
-    if token:
-        headers["Authorization"] = f"token {token}"
 
-    repos_found = []
-    page = 1
-    per_page = 100 # Max autorisé par GitHub par page
+    if limit < 1:
+        return []
 
-    while len(repos_found) < limit:
-        params = {
-            "q": query,
-            "sort": "stars", # On veut les plus populaires
-            "order": "desc",
-            "per_page": per_page,
-            "page": page
-        }
+    pages = []
+    found = 0
+    per_page = min(100, limit) # 100 = max autorisé par GitHub par page
+    n_pages = min(10, math.ceil(limit / per_page)) # GitHub plafonne à 1000 résultats
 
-        try:
-            r = requests.get(api_url, headers=headers, params=params, timeout=10)
-            
-            if r.status_code == 401:
-                print("❌ Erreur : Votre Token est invalide.")
-                return []
-            elif r.status_code == 403:
-                print("⚠️ Limite d'API GitHub atteinte (Rate Limit).")
-                break
-            elif r.status_code != 200:
-                print(f"⚠️ Erreur API ({r.status_code})")
-                break
-
-            data = r.json()
-            items = data.get("items", [])
-            
-            if not items:
-                break # Plus de résultats
-
-            for item in items:
-                repos_found.append({
-                    "name": item["name"],
-                    "full_name": item["full_name"],
-                    "clone_url": item["clone_url"],
-                    "stars": item["stargazers_count"],
-                    "owner": item["owner"]["login"]
-                })
-                if len(repos_found) >= limit:
-                    break
-            
-            page += 1
-            if page > 10: break # Sécurité anti-boucle infinie
+    params = {
+        "q": query,
+        "sort": "stars", # On veut les plus populaires
+        "order": "desc",
+        "per_page": per_page
+    }
 
-        except Exception as e:
-            print(f"❌ Erreur de connexion : {e}")
+    cache = load_etag_cache()
+    keys = [f"{query}|{per_page}|{page}" for page in range(1, n_pages + 1)]
+    cache_changed = False
+
+    # Toutes les pages sont demandées en même temps (une seule attente réseau)
+    with ThreadPoolExecutor(max_workers=n_pages) as executor:
+        responses = list(executor.map(
+            lambda p: fetch_search_page(api_url, params, p, cache.get(keys[p - 1])),
+            range(1, n_pages + 1)
+        ))
+
+    for key, r in zip(keys, responses):
+        if isinstance(r, Exception):
+            print(f"❌ Erreur de connexion : {r}")
             break
+        if r.status_code == 401:
+            print("❌ Erreur : Votre Token est invalide.")
+            return []
+        elif r.status_code == 403:
+            print("⚠️ Limite d'API GitHub atteinte (Rate Limit).")
+            break
+        elif r.status_code == 304:
+            page_repos = cache[key]["repos"] # Inchangé depuis la dernière recherche
+            cache[key]["used"] = time.time()
+            cache_changed = True
+        elif r.status_code != 200:
+            print(f"⚠️ Erreur API ({r.status_code})")
+            break
+        else:
+            data = json_loads(r.content)
+            page_repos = [{
+                "name": item["name"],
+                "full_name": item["full_name"],
+                "clone_url": item["clone_url"],
+                "stars": item["stargazers_count"],
+                "owner": item["owner"]["login"],
+                "default_branch": item.get("default_branch"),
+                "size": item.get("size", 0) # En Ko, d'après GitHub
+            } for item in data.get("items", [])]
+
+            etag = r.headers.get("ETag")
+            if etag:
+                cache[key] = {"etag": etag, "repos": page_repos, "query": query, "used": time.time()}
+                cache_changed = True
+
+        if not page_repos:
+            break # Plus de résultats
+
+        pages.append(page_repos)
+        found += len(page_repos)
+
+        if found >= limit:
+            break
+
+    if cache_changed:
+        save_etag_cache(cache)
 
-    # On trie une dernière fois par étoiles au cas où
-    repos_found.sort(key=lambda x: x['stars'], reverse=True)
-    return repos_found[:limit]
+    # Chaque page est déjà triée par étoiles : une fusion suffit (pas de tri complet)
+    merged = heapq.merge(*pages, key=lambda x: x['stars'], reverse=True)
+    return list(itertools.islice(merged, limit))
 
 # =====================================================
 # 2. Module de Clonage
 # =====================================================
 
-def clone_single_repo(repo_info, token):
-    """Fonction exécutée par les threads pour cloner."""
+class DeadlineReader(io.RawIOBase):
+    """Lit source jusqu'à une échéance globale.
+
+    Le timeout de requests ne borne que chaque lecture : un serveur qui envoie
+    quelques octets à la fois ferait durer le téléchargement indéfiniment.
+    """
+
+    def __init__(self, source, deadline):
+        super().__init__()
+        self._source = source
+        self._deadline = deadline
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if time.monotonic() > self._deadline:
+            raise TimeoutError("Téléchargement trop long")
+        # read1 rend la main dès que des octets arrivent (readinto attendrait de
+        # remplir tout le tampon), donc l'échéance est vérifiée au moins toutes les 30 s
+        if not hasattr(self._source, "read1"):
+            return self._source.readinto(b) # urllib3 1.x : pas de read1
+        data = self._source.read1(len(b))
+        n = len(data)
+        b[:n] = data
+        return n
+
+class ChunkPipe(io.RawIOBase):
+    """Flux lisible alimenté par un thread qui lit le réseau en arrière-plan.
+
+    Le téléchargement continue pendant que le thread appelant décompresse et
+    extrait l'archive, au lieu d'alterner entre les deux.
+    """
+
+    def __init__(self, source, chunk_size=64 * 1024, depth=64):
+        super().__init__()
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._pump, args=(source, chunk_size), daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        # File bornée : on réessaie tant que le lecteur n'a pas abandonné
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                pass
+
+    def _pump(self, source, chunk_size):
+        try:
+            while not self._stop.is_set():
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                self._put(chunk)
+        except Exception as e:
+            self._put(e)
+        self._put(b"") # Fin du flux
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._chunk:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._chunk = memoryview(item)
+        n = min(len(b), len(self._chunk))
+        b[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+    def close(self):
+        self._stop.set()
+        super().close()
+
+def extract_link(member, root, dest):
+    """Crée un lien de l'archive sans jamais relire l'archive (impossible en flux).
+
+    Si le système refuse les liens (Windows sans mode développeur...), on fait
+    comme git avec core.symlinks=false : un lien symbolique devient un fichier
+    texte contenant sa cible, un lien physique devient une copie.
+    """
+    try:
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if os.path.lexists(dest):
+            os.unlink(dest)
+        if member.issym():
+            os.symlink(member.linkname, dest)
+        else:
+            os.link(os.path.join(root, member.linkname), dest)
+        return
+    except OSError:
+        pass
+    try:
+        if member.issym():
+            with open(dest, "w", encoding="utf-8") as f:
+                f.write(member.linkname)
+        else:
+            shutil.copyfile(os.path.join(root, member.linkname), dest)
+    except OSError:
+        pass # Lien ignoré plutôt que de perdre tout le dépôt
+
+def extract_tarball(fileobj, target):
+    """Extrait une archive GitHub (tar.gz en streaming) dans target."""
+    root = os.path.abspath(target)
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            # GitHub place tout dans un dossier "owner-repo-sha/" : on le retire
+            parts = member.name.split("/", 1)
+            if len(parts) < 2 or not parts[1]:
+                continue
+            member.name = parts[1]
+            if member.islnk():
+                member.linkname = member.linkname.split("/", 1)[-1]
+
+            # Filtre "data" de tarfile avant le makedirs : chemins absolus, "..",
+            # liens (y compris en chaîne) sortant de root et fichiers spéciaux refusés
+            try:
+                member = tarfile.data_filter(member, root)
+            except tarfile.FilterError:
+                continue
+
+            dest = os.path.join(root, member.name)
+            if member.isdir():
+                os.makedirs(dest, exist_ok=True) # Pas d'appel à tar.extract pour un dossier
+                continue
+            # Le repli de tarfile pour les liens relit l'archive : StreamError en flux
+            if member.issym() or member.islnk():
+                extract_link(member, root, dest)
+                continue
+
+            # set_attrs=False : pas de utime/chown sur chaque fichier
+            # Membre déjà filtré ci-dessus : inutile de refaire le contrôle
+            tar.extract(member, root, set_attrs=False, filter="fully_trusted")
+            # Seul le bit exécutable compte (gradlew, configure, scripts/*.sh...)
+            if member.mode & 0o111:
+                os.chmod(dest, 0o755)
+
+def clone_single_repo(repo_info):
+    """Fonction exécutée par les threads pour télécharger un dépôt (tarball)."""
     # Nom du dossier : NomRepo_Proprietaire (pour éviter les doublons)
     folder_name = clean_filename(f"{repo_info['name']}_{repo_info['owner']}")
-    target_path = WORK_DIR / folder_name
+    # Chemins en str + os.path sur le chemin critique (pas d'objets Path par dépôt)
+    target = os.path.join(WORK_DIR, folder_name)
 
-    if target_path.exists():
-        return None # Déjà cloné
+    if os.path.exists(target):
+        return None # Déjà téléchargé
 
-    # URL authentifiée pour éviter les limites de clonage
-    clone_url = repo_info["clone_url"]
-    if token and clone_url.startswith("https://github.com/"):
-        auth_url = clone_url.replace("https://", f"https://{token}@", 1)
-    else:
-        auth_url = clone_url
+    # Archive de la branche par défaut directement sur codeload : pas de .git,
+    # pas de sous-processus, et pas de redirection depuis api.github.com
+    branch = repo_info.get("default_branch")
+    # Nom de branche échappé : "#", "?", "%" ou espaces casseraient l'URL
+    ref = f"refs/heads/{quote(branch, safe='/')}" if branch else "HEAD"
+    url = f"https://codeload.github.com/{repo_info['full_name']}/tar.gz/{ref}"
 
-    # Variables d'environnement pour empêcher Git de demander un mot de passe (bloquant)
-    env = os.environ.copy()
-    env["GIT_TERMINAL_PROMPT"] = "0"
+    deadline = time.monotonic() + DOWNLOAD_TIMEOUT
 
     try:
-        subprocess.run(
-            ["git", "clone", "--depth", "1", auth_url, str(target_path)],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=180, # 3 minutes max par repo
-            check=True,
-            env=env
-        )
-        
-        # Nettoyage : on supprime le dossier caché .git pour alléger le ZIP
-        git_hidden = target_path / ".git"
-        if git_hidden.exists():
-            shutil.rmtree(git_hidden, ignore_errors=True)
-            
+        # (connexion, lecture) : chaque lecture bloque 30 s max, l'échéance borne le total
+        with SESSION.get(url, stream=True, timeout=(10, 30)) as r:
+            r.raise_for_status()
+            source = DeadlineReader(r.raw, deadline)
+            # Gros dépôt : le réseau est lu dans un thread à part (pipeline)
+            if (repo_info.get("size") or 0) >= PIPELINE_MIN_KB:
+                source = ChunkPipe(source)
+            # BufferedReader ferme seulement ses enveloppes, jamais r.raw
+            with io.BufferedReader(source, buffer_size=1 << 20) as buf:
+                extract_tarball(buf, target)
+                # tar s'arrête au marqueur de fin : on lit le reste (fin gzip, padding)
+                # pour que la connexion puisse retourner dans le pool keep-alive
+                while buf.read(1 << 16):
+                    pass
+            r.raw.release_conn()
+
         return repo_info
     except Exception:
-        # Si échec, on nettoie le dossier vide
-        if target_path.exists():
-            shutil.rmtree(target_path, ignore_errors=True)
+        # Si échec, on nettoie le dossier partiel
+        if os.path.exists(target):
+            shutil.rmtree(target, ignore_errors=True)
         return None
 
+# =====================================================
+# 3. Module de Compression
+# =====================================================
+
+def read_zip_entry(full, arcname):
+    """Fonction exécutée par les threads : stat + lecture d'un fichier à archiver."""
+    if not os.path.isfile(full):
+        return None # Lien cassé ou fichier spécial : ignoré, comme shutil.make_archive
+    info = zipfile.ZipInfo.from_file(full, arcname)
+    if info.file_size > ZIP_READ_AHEAD_MAX:
+        return info, None # Trop gros pour la mémoire : écrit en streaming plus tard
+    with open(full, "rb") as f:
+        return info, f.read()
+
+def write_zip_entry(zf, full, future):
+    entry = future.result()
+    if entry is None:
+        return
+    info, data = entry
+    if data is None:
+        zf.write(full, info.filename)
+    else:
+        # ZipInfo.from_file vaut ZIP_STORED par défaut : on impose le réglage de l'archive
+        zf.writestr(info, data, compress_type=zf.compression, compresslevel=zf.compresslevel)
+
+def create_zip(source_dir, zip_path):
+    """Archive source_dir en DEFLATE niveau 1 : du code source, donc un ZIP bien plus
+    petit pour un coût CPU minime.
+
+    Les lectures (stat + contenu) sont faites en avance par un pool de threads,
+    le thread principal compresse et écrit les entrées dans l'ordre : zlib libère
+    le GIL, donc les lectures disque continuent pendant la compression.
+    L'archive est écrite dans un ".tmp" voisin puis renommée : un ZIP partiel
+    n'apparaît jamais à l'emplacement final.
+    """
+    workers = os.cpu_count() or 4
+    pending = deque()
+    tmp_path = f"{zip_path}.tmp"
+
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=1) as zf, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            for root, dirs, files in os.walk(source_dir):
+                # Entrées de dossiers : les dossiers vides sont conservés
+                for name in dirs:
+                    full = os.path.join(root, name)
+                    zf.write(full, os.path.relpath(full, source_dir))
+                for name in files:
+                    full = os.path.join(root, name)
+                    arcname = os.path.relpath(full, source_dir)
+                    pending.append((full, executor.submit(read_zip_entry, full, arcname)))
+                    # Fenêtre bornée pour ne pas charger tout le dossier en mémoire
+                    if len(pending) >= workers * 4:
+                        write_zip_entry(zf, *pending.popleft())
+
+            while pending:
+                write_zip_entry(zf, *pending.popleft())
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Même dossier, donc même disque : un simple rename(2), atomique
+    os.replace(tmp_path, zip_path)
+
 # =====================================================
 # MAIN LOOP
 # =====================================================
@@ -182,10 +512,10 @@ def clone_single_repo(repo_info, token):
 def main():
     print_banner()
 
-    # 0. Vérification Git
-    if not check_git_installed():
-        print("❌ Erreur : GIT n'est pas installé sur cet ordinateur.")
-        print("Installez Git ici : https://git-scm.com/downloads")
+    # 0. Vérification Python : l'extraction sûre des archives exige tarfile.data_filter
+    if not hasattr(tarfile, "data_filter"):
+        print("❌ Erreur : cette version de Python ne sait pas extraire les archives en sécurité.")
+        print("Installez Python 3.12+ (ou 3.8.17 / 3.9.17 / 3.10.12 / 3.11.4 minimum).")
         sys.exit(1)
 
     # 1. Inputs Utilisateur (INTERACTIF)
@@ -195,6 +525,7 @@ def main():
     print("1. Collez votre Token GitHub (Classic) pour l'accès API.")
     print("   (Si vous n'en avez pas, appuyez juste sur Entrée, mais la recherche sera limitée)")
     user_token = input("   👉 Token : ").strip()
+    configure_session(user_token)
 
     # B. Recherche
     print("\n2. Que cherchez-vous ? (ex: 'trading bot python', 'portfolio react', 'django ecommerce')")
@@ -214,11 +545,11 @@ def main():
 
     # 2. Préparation Dossiers
     if WORK_DIR.exists():
-        shutil.rmtree(WORK_DIR, ignore_errors=True)
+        fast_rmtree(WORK_DIR)
     WORK_DIR.mkdir(parents=True, exist_ok=True)
 
     # 3. Lancement Recherche
-    repos = search_github(user_query, user_limit, user_token)
+    repos = search_github(user_query, user_limit)
 
     if not repos:
         print("\n❌ Aucun dépôt trouvé. Fin du programme.")
@@ -229,13 +560,13 @@ def main():
     # 4. Clonage Multi-thread
     success_count = 0
     
-    # On utilise 8 "ouvriers" en parallèle pour aller vite
-    with ThreadPoolExecutor(max_workers=8) as executor:
+    # Plusieurs "ouvriers" en parallèle pour aller vite (GITHUB_AGENT_WORKERS)
+    with ThreadPoolExecutor(max_workers=CLONE_WORKERS) as executor:
         # On prépare les tâches
-        futures = [executor.submit(clone_single_repo, r, user_token) for r in repos]
+        futures = {executor.submit(clone_single_repo, r): r for r in repos}
         
-        # On affiche la barre de progression
-        for future in tqdm(futures, total=len(repos), desc="⬇️  Téléchargement", unit="repo"):
+        # On affiche la barre de progression (elle avance dès qu'un dépôt est fini)
+        for future in tqdm(as_completed(futures), total=len(repos), desc="⬇️  Téléchargement", unit="repo"):
             result = future.result()
             if result:
                 success_count += 1
@@ -243,30 +574,31 @@ def main():
     # 5. Rapport
     timestamp = datetime.now().strftime("%Y-%m-%d_%Hh%Mm")
     report_file = WORK_DIR / "_RAPPORT_DE_RECHERCHE.txt"
-    with open(report_file, "w", encoding="utf-8") as f:
-        f.write(f"Rapport généré le {timestamp}\n")
-        f.write(f"Recherche : {user_query}\n")
-        f.write(f"Projets demandés : {user_limit}\n")
-        f.write(f"Projets téléchargés : {success_count}\n")
-        f.write("-" * 30 + "\n")
-        for r in repos:
-            f.write(f"[{r['stars']}★] {r['full_name']} -> {r['clone_url']}\n")
+    lines = [
+        f"Rapport généré le {timestamp}\n",
+        f"Recherche : {user_query}\n",
+        f"Projets demandés : {user_limit}\n",
+        f"Projets téléchargés : {success_count}\n",
+        "-" * 30 + "\n"
+    ]
+    lines.extend(f"[{r['stars']}★] {r['full_name']} -> {r['clone_url']}\n" for r in repos)
+    report_file.write_text("".join(lines), encoding="utf-8")
 
     # 6. Compression (ZIP)
     print("\n📦 Création de l'archive ZIP...")
     safe_query_name = clean_filename(user_query)
-    zip_filename = f"GITHUB_{safe_query_name}_{timestamp}"
+    zip_filename = f"GITHUB_{safe_query_name}_{timestamp}.zip"
     output_zip_path = BASE_DIR / zip_filename
 
-    shutil.make_archive(str(output_zip_path), 'zip', WORK_DIR)
+    create_zip(WORK_DIR, output_zip_path)
 
     # Nettoyage temporaire
-    shutil.rmtree(WORK_DIR, ignore_errors=True)
+    fast_rmtree(WORK_DIR)
 
     print("\n" + "="*60)
     print("✅ MISSION ACCOMPLIE !")
     print(f"📂 Votre fichier est prêt ici :")
-    print(f"   👉 {output_zip_path}.zip")
+    print(f"   👉 {output_zip_path}")
     print("="*60 + "\n")
 
 if __name__ == "__main__":